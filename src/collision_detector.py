@@ -4,9 +4,15 @@ Analyzes potential collisions between satellites and space debris
 """
 
 import numpy as np
-from datetime import datetime, timedelta
-from typing import List, Dict, Tuple, Optional
-import matplotlib.pyplot as plt
+from math import sqrt
+from datetime import datetime
+from typing import Dict, Tuple
+
+from src.kernels import pairwise_distance_series
+from src.utils import time_grid
+
+# Risk levels indexed by severity code (0 = lowest)
+RISK_LEVELS = ('LOW', 'MEDIUM', 'HIGH')
 
 class CollisionDetector:
     """
@@ -17,67 +23,93 @@ class CollisionDetector:
         self.warning_distance_km = warning_distance_km
         self.earth_radius = 6371  # km
     
-    def calculate_distance(self, pos1: Tuple[float, float, float], 
+    @staticmethod
+    def calculate_distance(pos1: Tuple[float, float, float], 
                           pos2: Tuple[float, float, float]) -> float:
         """
         Calculate 3D distance between two satellite positions
         """
-        x1, y1, z1 = pos1
-        x2, y2, z2 = pos2
-        return np.sqrt((x2-x1)**2 + (y2-y1)**2 + (z2-z1)**2)
+        dx = pos2[0] - pos1[0]
+        dy = pos2[1] - pos1[1]
+        dz = pos2[2] - pos1[2]
+        return sqrt(dx*dx + dy*dy + dz*dz)
+    
+    @staticmethod
+    def calculate_squared_distance(pos1: Tuple[float, float, float], 
+                                  pos2: Tuple[float, float, float]) -> float:
+        """
+        Squared 3D distance, for ranking or threshold checks that can skip the sqrt
+        (compare against warning_distance_km ** 2)
+        """
+        dx = pos2[0] - pos1[0]
+        dy = pos2[1] - pos1[1]
+        dz = pos2[2] - pos1[2]
+        return dx*dx + dy*dy + dz*dz
     
     def analyze_close_approach(self, predictor, sat1_name: str, sat2_name: str,
-                             duration_hours: float = 24, points: int = 200) -> Dict:
+                             duration_hours: float = 24, points: int = 200,
+                             refine_candidates: int = 3, refine_points: int = 100) -> Dict:
         """
         Analyze potential close approaches between two satellites
         
+        The window is scanned at `points` samples, then the deepest
+        `refine_candidates` local minima are re-propagated densely
+        (`refine_points` samples across one coarse step either side)
+        to pin down the true closest approach.
+        
         Returns:
             Dictionary with collision analysis results
         """
-        # Generate orbital paths for both satellites
+        # Propagate both satellites over one shared time grid
+        sample_times = time_grid(duration_hours, points)
         try:
-            x1, y1, z1 = predictor.generate_orbit_path(sat1_name, duration_hours, points)
-            x2, y2, z2 = predictor.generate_orbit_path(sat2_name, duration_hours, points)
+            r1 = predictor.propagate(sat1_name, sample_times)
+            r2 = predictor.propagate(sat2_name, sample_times)
         except Exception as e:
             return {'error': f"Could not generate orbits: {e}"}
         
-        # Calculate distances at each time point
-        distances = []
-        times = []
-        start_time = datetime.utcnow()
-        
-        for i in range(len(x1)):
-            pos1 = (x1[i], y1[i], z1[i])
-            pos2 = (x2[i], y2[i], z2[i])
-            distance = self.calculate_distance(pos1, pos2)
-            distances.append(distance)
-            
-            # Calculate corresponding time
-            time_delta = (duration_hours * i / points)
-            times.append(start_time + timedelta(hours=time_delta))
-        
-        distances = np.array(distances)
-        
-        # Find closest approach
-        min_distance_idx = np.argmin(distances)
-        min_distance = distances[min_distance_idx]
-        closest_time = times[min_distance_idx]
+        # Calculate distances at every time point in one fused pass
+        distances = pairwise_distance_series(r1, r2)
+        
+        # Keep the time axis as datetime64; only the reported instant is converted
+        times = sample_times
+        dt_seconds = duration_hours * 3600 / max(points - 1, 1)
+        
+        # Candidate minima: coarse local minima plus the global minimum (may sit at an edge)
+        interior = distances[1:-1]
+        local_minima = np.flatnonzero((interior < distances[:-2]) & (interior < distances[2:])) + 1
+        candidates = np.union1d(local_minima, [np.argmin(distances)])
+        candidates = candidates[np.argsort(distances[candidates])[:refine_candidates]]
+        
+        # Refine each candidate and keep the deepest
+        step = np.timedelta64(int(dt_seconds * 1e6), 'us')
+        min_distance = np.inf
+        for idx in candidates:
+            start = np.maximum(times[idx] - step, times[0])
+            end = np.minimum(times[idx] + step, times[-1])
+            distance, when = self._refine_minimum(predictor, sat1_name, sat2_name,
+                                                  start, end, refine_points)
+            if distance < min_distance:
+                min_distance, closest_time64, min_distance_idx = distance, when, idx
+        
+        if not np.isfinite(min_distance):
+            return {'error': "Could not locate a closest approach"}
+        closest_time = closest_time64.astype(datetime)
         
         # Find all close approaches within warning distance
         warning_indices = np.where(distances < self.warning_distance_km)[0]
         
-        # Calculate relative velocity at closest approach
-        if min_distance_idx > 0 and min_distance_idx < len(distances) - 1:
-            # Simple velocity approximation
-            dt = duration_hours / points  # hours
-            dt_seconds = dt * 3600  # convert to seconds
-            
-            # Distance change rate
-            dist_before = distances[min_distance_idx - 1]
-            dist_after = distances[min_distance_idx + 1]
-            relative_velocity = abs(dist_after - dist_before) / (2 * dt_seconds)  # km/s
+        # Range-rate profile over the whole window (km/s)
+        if len(distances) > 1:
+            rel_speed = np.abs(np.gradient(distances, dt_seconds))
         else:
-            relative_velocity = 0
+            rel_speed = np.zeros_like(distances)
+        relative_velocity = rel_speed[min_distance_idx]
+        
+        # Classify every sample and report the worst level reached
+        samples = np.append(distances, min_distance)
+        risk_codes = np.select([samples < 1, samples < 5], [2, 1], default=0)
+        collision_risk = RISK_LEVELS[risk_codes.max()]
         
         return {
             'satellite_1': sat1_name,
@@ -85,12 +117,27 @@ class CollisionDetector:
             'min_distance_km': min_distance,
             'closest_approach_time': closest_time,
             'relative_velocity_km_s': relative_velocity,
-            'collision_risk': 'HIGH' if min_distance < 1 else 'MEDIUM' if min_distance < 5 else 'LOW',
+            'collision_risk': collision_risk,
             'warning_periods': len(warning_indices),
+            'warning_velocities': rel_speed[warning_indices],
             'all_distances': distances,
             'times': times
         }
     
+    def _refine_minimum(self, predictor, sat1_name: str, sat2_name: str,
+                        start: np.datetime64, end: np.datetime64, points: int):
+        """
+        Densely re-sample [start, end] and return (distance_km, time) at its minimum
+        """
+        span_us = (end - start) / np.timedelta64(1, 'us')
+        offsets_us = np.linspace(0, span_us, points).astype(np.int64)
+        fine_times = start + offsets_us.astype('timedelta64[us]')
+        
+        distances = pairwise_distance_series(predictor.propagate(sat1_name, fine_times),
+                                             predictor.propagate(sat2_name, fine_times))
+        idx = np.argmin(distances)
+        return distances[idx], fine_times[idx]
+    
     def plot_collision_analysis(self, analysis_result: Dict):
         """
         Plot collision analysis results
@@ -99,6 +146,8 @@ class CollisionDetector:
             print(f"Error: {analysis_result['error']}")
             return
         
+        import matplotlib.pyplot as plt
+        
         fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(12, 10))
         
         # Plot 1: Distance over time
@@ -109,10 +158,10 @@ class CollisionDetector:
         ax1.axhline(y=self.warning_distance_km, color='r', linestyle='--', 
                    label=f'Warning Threshold ({self.warning_distance_km} km)')
         
-        # Mark closest approach
-        min_idx = np.argmin(distances)
-        ax1.plot(times[min_idx], distances[min_idx], 'ro', markersize=10, 
-                label=f"Closest Approach: {distances[min_idx]:.2f} km")
+        # Mark closest approach (refined, so it can fall between samples)
+        min_distance = analysis_result['min_distance_km']
+        ax1.plot(analysis_result['closest_approach_time'], min_distance, 'ro', markersize=10, 
+                label=f"Closest Approach: {min_distance:.2f} km")
         
         ax1.set_ylabel('Distance (km)')
         ax1.set_title(f"Collision Analysis: {analysis_result['satellite_1']} vs {analysis_result['satellite_2']}")
@@ -159,7 +208,7 @@ COLLISION ASSESSMENT:
 
 RECOMMENDATIONS:
 """
-        
+
         if analysis_result['collision_risk'] == 'HIGH':
             report += "• IMMEDIATE ATTENTION REQUIRED\n• Consider avoidance maneuver\n• Continuous monitoring recommended"
         elif analysis_result['collision_risk'] == 'MEDIUM':
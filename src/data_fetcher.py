@@ -5,8 +5,8 @@ Downloads and parses Two-Line Element data from various sources
 
 import requests
 import os
-from datetime import datetime
-from typing import List, Dict, Optional
+import json
+from typing import Dict
 import time
 
 class TLEDataFetcher:
@@ -14,8 +14,9 @@ class TLEDataFetcher:
     Handles downloading and caching TLE data from CelesTrak and other sources
     """
     
-    def __init__(self, cache_dir: str = "../data"):
+    def __init__(self, cache_dir: str = "../data", max_age_hours: float = 2.0):
         self.cache_dir = cache_dir
+        self.max_age_hours = max_age_hours
         self.base_urls = {
             'stations': 'https://celestrak.org/NORAD/elements/stations.txt',
             'active': 'https://celestrak.org/NORAD/elements/active.txt',
@@ -30,23 +31,66 @@ class TLEDataFetcher:
     def download_tle_data(self, category: str = 'stations', force_refresh: bool = False) -> str:
         """
         Download TLE data for a specific satellite category
+        
+        A cached copy younger than max_age_hours is returned as-is (unless
+        force_refresh is set); otherwise it is revalidated with the server's
+        ETag / Last-Modified so unchanged data is not downloaded again.
         """
         if category not in self.base_urls:
             raise ValueError(f"Unknown category: {category}")
         
-        # Create filename with timestamp
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"{category}_{timestamp}.tle"
-        filepath = os.path.join(self.cache_dir, filename)
+        filepath = os.path.join(self.cache_dir, f"{category}.tle")
+        meta_path = os.path.join(self.cache_dir, f"{category}.meta.json")
+        meta = self._load_metadata(meta_path) if os.path.exists(filepath) else {}
+        
+        # Serve recent data straight from disk
+        if meta and not force_refresh:
+            age_hours = (time.time() - meta.get('fetched_at', 0)) / 3600
+            if age_hours < self.max_age_hours:
+                print(f"Using cached {category} TLE data: {filepath}")
+                return filepath
+        
+        headers = {}
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
         
-        # Download the data
+        # Download the data, streaming bytes straight to disk
         print(f"Downloading {category} TLE data...")
-        response = requests.get(self.base_urls[category], timeout=30)
-        response.raise_for_status()
+        with requests.get(self.base_urls[category], headers=headers,
+                          stream=True, timeout=30) as response:
+            if response.status_code == 304:
+                print(f"{category} TLE data unchanged, keeping {filepath}")
+            else:
+                response.raise_for_status()
+                
+                # Write to a temp file so a failed transfer never clobbers the cache
+                # (iter_content also undoes any gzip transfer encoding)
+                tmp_path = filepath + '.part'
+                with open(tmp_path, 'wb') as f:
+                    for chunk in response.iter_content(chunk_size=16384):
+                        f.write(chunk)
+                os.replace(tmp_path, filepath)
+                
+                meta = {
+                    'etag': response.headers.get('ETag'),
+                    'last_modified': response.headers.get('Last-Modified'),
+                }
+                print(f"Downloaded to {filepath}")
         
-        # Save to file
-        with open(filepath, 'w') as f:
-            f.write(response.text)
+        meta['fetched_at'] = time.time()
+        with open(meta_path, 'w') as f:
+            json.dump(meta, f)
         
-        print(f"Downloaded to {filepath}")
-        return filepath
\ No newline at end of file
+        return filepath
+    
+    def _load_metadata(self, meta_path: str) -> Dict:
+        """
+        Read the cache sidecar, treating a missing or corrupt file as empty
+        """
+        try:
+            with open(meta_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
@@ -4,9 +4,10 @@ Calculates and visualizes satellite ground tracks (where satellites pass over Ea
 """
 
 import numpy as np
-import matplotlib.pyplot as plt
-from datetime import datetime, timedelta
-from typing import Tuple, List
+from typing import Tuple
+
+from src.kernels import count_sign_changes
+from src.utils import time_grid, julian_date, teme_to_geodetic
 
 class GroundTrackCalculator:
     """
@@ -24,35 +25,21 @@ class GroundTrackCalculator:
         Returns:
             (latitudes, longitudes) arrays in degrees
         """
-        if satellite_name not in predictor.satellites:
-            raise ValueError(f"Satellite '{satellite_name}' not found")
-        
-        satellite = predictor.satellites[satellite_name]
-        
-        # Create time array
-        start_time = datetime.utcnow()
-        time_deltas = np.linspace(0, duration_hours, points)
-        
-        latitudes = []
-        longitudes = []
+        # Propagate the whole track at once and convert TEME to lat/lon
+        times = time_grid(duration_hours, points)
+        positions = predictor.propagate(satellite_name, times)
+        jd, fr = julian_date(times)
+        latitudes, longitudes, _ = teme_to_geodetic(positions, jd, fr)
         
-        for delta in time_deltas:
-            dt = start_time + timedelta(hours=delta)
-            t = predictor.ts.utc(dt.year, dt.month, dt.day, dt.hour, dt.minute, dt.second)
-            
-            geocentric = satellite.at(t)
-            subpoint = geocentric.subpoint()
-            
-            latitudes.append(subpoint.latitude.degrees)
-            longitudes.append(subpoint.longitude.degrees)
-        
-        return np.array(latitudes), np.array(longitudes)
+        return latitudes, longitudes
     
     def plot_ground_track_simple(self, latitudes: np.ndarray, longitudes: np.ndarray, 
                                satellite_name: str):
         """
         Simple ground track plot using matplotlib
         """
+        import matplotlib.pyplot as plt
+        
         fig, ax = plt.subplots(figsize=(15, 8))
         
         # Plot world map outline
@@ -87,11 +74,13 @@ class GroundTrackCalculator:
         """
         Analyze ground track coverage statistics
         """
+        lat_min, lat_max = np.min(latitudes), np.max(latitudes)
+        
         return {
-            'max_latitude': np.max(latitudes),
-            'min_latitude': np.min(latitudes),
-            'latitude_range': np.max(latitudes) - np.min(latitudes),
+            'max_latitude': lat_max,
+            'min_latitude': lat_min,
+            'latitude_range': lat_max - lat_min,
             'longitude_span': np.max(longitudes) - np.min(longitudes),
-            'equatorial_crossings': np.sum(np.diff(np.sign(latitudes)) != 0),
+            'equatorial_crossings': count_sign_changes(np.ascontiguousarray(latitudes)),
             'total_points': len(latitudes)
         }
\ No newline at end of file
@@ -0,0 +1,92 @@
+"""
+Numba Kernels Module
+JIT-compiled versions of the kernels in src/kernels.py, enabled with src.kernels.use_numba()
+"""
+
+import numpy as np
+from numba import njit
+
+from src.kernels import WGS84_A, WGS84_B, WGS84_E2, WGS84_EP2, RAD2DEG
+
+# Full fastmath minus nnan/ninf: failed SGP4 samples are NaN and must stay NaN
+_FASTMATH = {'nsz', 'arcp', 'contract', 'afn', 'reassoc'}
+
+@njit(fastmath=_FASTMATH, cache=True)
+def teme_to_geodetic(r, gmst):
+    """
+    Rotate TEME positions by GMST and convert to WGS84 geodetic coordinates
+    
+    Returns:
+        (latitude_deg, longitude_deg, altitude_km) arrays of length N
+    """
+    n = r.shape[0]
+    lat = np.empty(n)
+    lon = np.empty(n)
+    alt = np.empty(n)
+    
+    for i in range(n):
+        cos_t = np.cos(gmst[i])
+        sin_t = np.sin(gmst[i])
+        x = cos_t * r[i, 0] + sin_t * r[i, 1]
+        y = cos_t * r[i, 1] - sin_t * r[i, 0]
+        z = r[i, 2]
+        
+        p = np.sqrt(x * x + y * y)
+        beta = np.arctan2(z * WGS84_A, p * WGS84_B)
+        sin_b = np.sin(beta)
+        cos_b = np.cos(beta)
+        phi = np.arctan2(z + WGS84_EP2 * WGS84_B * sin_b * sin_b * sin_b,
+                         p - WGS84_E2 * WGS84_A * cos_b * cos_b * cos_b)
+        sin_phi = np.sin(phi)
+        
+        lat[i] = phi * RAD2DEG
+        lon[i] = np.arctan2(y, x) * RAD2DEG
+        alt[i] = (p * np.cos(phi) + z * sin_phi
+                  - WGS84_A * np.sqrt(1 - WGS84_E2 * sin_phi * sin_phi))
+    
+    return lat, lon, alt
+
+@njit(fastmath=_FASTMATH, cache=True)
+def pairwise_distance_series(r1, r2):
+    """
+    Distance between matching rows of two (N, 3) position arrays
+    """
+    n = r1.shape[0]
+    dist = np.empty(n)
+    
+    for i in range(n):
+        dx = r2[i, 0] - r1[i, 0]
+        dy = r2[i, 1] - r1[i, 1]
+        dz = r2[i, 2] - r1[i, 2]
+        dist[i] = np.sqrt(dx * dx + dy * dy + dz * dz)
+    
+    return dist
+
+@njit(fastmath=_FASTMATH, cache=True)
+def altitude_series(r, radius):
+    """
+    Height above a spherical Earth of the given radius for each (N, 3) row
+    """
+    n = r.shape[0]
+    alt = np.empty(n)
+    
+    for i in range(n):
+        alt[i] = np.sqrt(r[i, 0] * r[i, 0] + r[i, 1] * r[i, 1] + r[i, 2] * r[i, 2]) - radius
+    
+    return alt
+
+@njit(cache=True)
+def count_sign_changes(values):
+    """
+    Number of adjacent pairs whose signs differ, in one allocation-free pass
+    """
+    count = 0
+    previous = np.sign(values[0]) if values.shape[0] else 0.0
+    
+    for i in range(1, values.shape[0]):
+        current = np.sign(values[i])
+        if current != previous:
+            count += 1
+        previous = current
+    
+    return count
@@ -4,10 +4,20 @@ Parses TLE data and predicts satellite positions using SGP4
 """
 
 from skyfield.api import load, EarthSatellite
-from skyfield.timelib import Time
-from datetime import datetime, timedelta
+from sgp4.api import Satrec, SatrecArray, jday
+from datetime import datetime
+import os
 import numpy as np
-from typing import List, Tuple, Dict
+from typing import List, Tuple, Dict, Optional
+
+from src.utils import time_grid, julian_date, teme_to_geodetic
+
+# Shared skyfield timescale, loaded on first use (parsing it is slow)
+_TS = None
+
+# Last parsed catalog per file: abspath -> (mtime, satellites). Reloading an
+# unchanged file is free; a rewritten file replaces its entry
+_CATALOG_CACHE = {}
 
 class SatelliteOrbitPredictor:
     """
@@ -16,88 +26,240 @@ class SatelliteOrbitPredictor:
     
     def __init__(self):
         self.satellites = {}
-        self.ts = load.timescale()
+        self.ts = SatelliteOrbitPredictor._get_timescale()
+        
+        # Derived from self.satellites; cleared whenever the catalog changes
+        self._resolved = {}
+        self._batch_arrays = {}
+        self._satrec_array = None
+        self._catalog_index = None
+    
+    @classmethod
+    def _get_timescale(cls):
+        """
+        Return the module-wide timescale, loading it only once
+        """
+        global _TS
+        if _TS is None:
+            _TS = load.timescale()
+        return _TS
     
     def load_tle_file(self, tle_filepath: str) -> Dict[str, EarthSatellite]:
         """
         Load satellites from a TLE file
         """
         print(f"Loading TLE file: {tle_filepath}")
-        satellites = load.tle_file(tle_filepath)
+        path = os.path.abspath(tle_filepath)
+        mtime = os.path.getmtime(path)
+        cached = _CATALOG_CACHE.get(path)
+        if cached is not None and cached[0] == mtime:
+            satellites = cached[1]
+        else:
+            satellites = self._parse_tle_file(tle_filepath)
+            _CATALOG_CACHE[path] = (mtime, satellites)
         
         # Store satellites by name
         for sat in satellites:
             self.satellites[sat.name] = sat
-            
+        self._invalidate_catalog()
+        
         print(f"Loaded {len(satellites)} satellites")
         return {sat.name: sat for sat in satellites}
-
+    
+    def _parse_tle_file(self, tle_filepath: str) -> List[EarthSatellite]:
+        """
+        Parse a TLE file, building every satellite epoch with one array Time call
+        """
+        names = []
+        satrecs = []
+        
+        # Same pairing rules as skyfield's parse_tle_file
+        with open(tle_filepath) as f:
+            previous = line1 = ''
+            for line in f:
+                if (line.startswith('2 ') and len(line) >= 69 and
+                        line1.startswith('1 ') and len(line1) >= 69):
+                    name = previous.rstrip(' \n\r')
+                    if name.startswith('0 '):
+                        name = name[2:]  # Spacetrack 3-line format
+                    names.append(name.strip() or None)
+                    satrecs.append(Satrec.twoline2rv(line1, line))
+                    previous = line1 = ''
+                else:
+                    previous, line1 = line1, line
+        
+        if not satrecs:
+            return []
+        
+        # Skyfield builds one Time per satellite; do them all at once instead
+        years = np.array([satrec.epochyr for satrec in satrecs])
+        years += np.where(years < 57, 2000, 1900)
+        epochs = self.ts.utc(years, 1, np.array([satrec.epochdays for satrec in satrecs]))
+        
+        satellites = []
+        try:
+            for i, (name, satrec) in enumerate(zip(names, satrecs)):
+                # Mirrors EarthSatellite.from_satrec with the epoch precomputed
+                sat = EarthSatellite.__new__(EarthSatellite)
+                sat.model = satrec
+                sat.name = name
+                sat.epoch = epochs[i]
+                sat._setup(satrec)
+                satellites.append(sat)
+        except (AttributeError, TypeError):
+            # Relies on skyfield internals; fall back to the public loader if they change
+            return load.tle_file(tle_filepath, ts=self.ts)
+        
+        return satellites
+    
+    def _invalidate_catalog(self):
+        """
+        Drop lookups derived from the satellite catalog
+        """
+        self._resolved = {}
+        self._batch_arrays = {}
+        self._satrec_array = None
+        self._catalog_index = None
+    
+    def _get_satellite(self, satellite_name: str) -> EarthSatellite:
+        """
+        Look up a satellite with a single dict access
+        """
+        try:
+            return self.satellites[satellite_name]
+        except KeyError:
+            raise ValueError(f"Satellite '{satellite_name}' not found") from None
+    
+    @property
+    def satrec_array(self) -> SatrecArray:
+        """
+        The whole catalog as one SatrecArray, in self.satellites order
+        """
+        if self._satrec_array is None:
+            self._satrec_array = SatrecArray([sat.model for sat in self.satellites.values()])
+        return self._satrec_array
+    
+    def _ensure_catalog_index(self) -> Dict[str, int]:
+        """
+        Map each satellite name to its row in self.satellites order (and satrec_array)
+        """
+        if self._catalog_index is None:
+            self._catalog_index = {name: i for i, name in enumerate(self.satellites)}
+        return self._catalog_index
+    
+    def resolve(self, satellite_names: List[str]) -> Tuple[List[EarthSatellite], np.ndarray]:
+        """
+        Resolve names once to satellite objects and rows of satrec_array
+        
+        Results are cached per name list, so repeat callers (e.g. every
+        dashboard render) skip the per-name lookups entirely.
+        
+        Returns:
+            (satellites, indices) in the order of satellite_names
+        """
+        key = tuple(satellite_names)
+        resolved = self._resolved.get(key)
+        if resolved is None:
+            satellites = [self._get_satellite(name) for name in key]
+            catalog_index = self._ensure_catalog_index()
+            indices = np.array([catalog_index[name] for name in key], dtype=np.intp)
+            resolved = self._resolved[key] = (satellites, indices)
+        return resolved
+    
     def predict_position(self, satellite_name: str, time_utc: datetime) -> Tuple[float, float, float]:
         """
         Predict satellite position at a specific time
         
         Returns:
-            (x, y, z) position in kilometers (Earth-centered coordinates)
+            (x, y, z) position in kilometers (Earth-centered TEME coordinates)
         """
-        if satellite_name not in self.satellites:
-            raise ValueError(f"Satellite '{satellite_name}' not found")
-        
-        satellite = self.satellites[satellite_name]
-        t = self.ts.utc(time_utc.year, time_utc.month, time_utc.day, 
-                       time_utc.hour, time_utc.minute, time_utc.second)
+        satellite = self._get_satellite(satellite_name)
+        jd, fr = jday(time_utc.year, time_utc.month, time_utc.day, time_utc.hour,
+                      time_utc.minute, time_utc.second + time_utc.microsecond / 1e6)
         
-        geocentric = satellite.at(t)
-        x, y, z = geocentric.position.km
+        e, r, v = satellite.model.sgp4(jd, fr)
+        x, y, z = r
         
         return x, y, z
     
+    def propagate(self, satellite_name: str, times: np.ndarray) -> np.ndarray:
+        """
+        Propagate a satellite to an array of UTC times with raw SGP4
+        
+        Returns:
+            (N, 3) array of TEME positions in kilometers
+        """
+        satellite = self._get_satellite(satellite_name)
+        jd, fr = julian_date(times)
+        
+        # Skip skyfield's frame machinery; failed propagations are NaN
+        e, r, v = satellite.model.sgp4_array(jd, fr)
+        return r
+    
     def generate_orbit_path(self, satellite_name: str, duration_hours: float = 24, 
-                          points: int = 100) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+                          points: int = 100, times: Optional[np.ndarray] = None
+                          ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
         """
         Generate orbital path for visualization
-        """
-        if satellite_name not in self.satellites:
-            raise ValueError(f"Satellite '{satellite_name}' not found")
         
-        satellite = self.satellites[satellite_name]
+        Pass times (UTC datetime64 array) to sample arbitrary instants
+        instead of duration_hours/points starting now.
+        """
+        if times is None:
+            times = time_grid(duration_hours, points)
+        positions = self.propagate(satellite_name, times)
+        x, y, z = positions.T
         
-        # Create time array properly
-        start_time = datetime.utcnow()
-        time_deltas = np.linspace(0, duration_hours, points)
+        return x, y, z
+    
+    def generate_orbit_paths(self, satellite_names: List[str], duration_hours: float = 24,
+                           points: int = 100, times: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Generate orbital paths for several satellites with one batched SGP4 call
         
-        # Calculate positions for all times
-        positions = []
-        for delta in time_deltas:
-            dt = start_time + timedelta(hours=delta)
-            t = self.ts.utc(dt.year, dt.month, dt.day, dt.hour, dt.minute, dt.second)
-            geocentric = satellite.at(t)
-            positions.append(geocentric.position.km)
+        Pass times (UTC datetime64 array) to propagate over an existing grid
+        instead of duration_hours/points starting now.
         
-        # Convert to arrays
-        positions = np.array(positions)
-        x, y, z = positions[:, 0], positions[:, 1], positions[:, 2]
+        Returns:
+            (S, 3, N) array of TEME positions in kilometers
+        """
+        # sgp4 already loops over satellites in C (OpenMP-parallel where built
+        # with it) while holding the GIL, so Python threads would not help;
+        # instead reuse the SatrecArray built for this selection.
+        key = tuple(satellite_names)
+        satrecs = self._batch_arrays.get(key)
+        if satrecs is None:
+            satellites, _ = self.resolve(key)
+            satrecs = self._batch_arrays[key] = SatrecArray([sat.model for sat in satellites])
+        if times is None:
+            times = time_grid(duration_hours, points)
+        jd, fr = julian_date(times)
         
-        return x, y, z
+        # r comes back as (S, N, 3); failed propagations are NaN
+        e, r, v = satrecs.sgp4(jd, fr)
+        return r.transpose(0, 2, 1)
     
-    def get_satellite_info(self, satellite_name: str) -> Dict:
+    def get_satellite_info(self, satellite_name: str, time_utc: Optional[datetime] = None) -> Dict:
         """
         Get detailed information about a satellite
-        """
-        if satellite_name not in self.satellites:
-            raise ValueError(f"Satellite '{satellite_name}' not found")
         
-        satellite = self.satellites[satellite_name]
+        Pass the same time_utc when querying several satellites so they share
+        one snapshot instant (and its cached GMST). Defaults to now.
+        """
+        satellite = self._get_satellite(satellite_name)
         
-        # Current position
-        now = self.ts.now()
-        geocentric = satellite.at(now)
-        subpoint = geocentric.subpoint()
+        # Position at the requested instant
+        now = time_utc if time_utc is not None else datetime.utcnow()
+        jd, fr = jday(now.year, now.month, now.day, now.hour,
+                      now.minute, now.second + now.microsecond / 1e6)
+        e, r, v = satellite.model.sgp4(jd, fr)
+        latitude, longitude, altitude = teme_to_geodetic(r, jd, fr)
         
         return {
             'name': satellite.name,
             'norad_id': satellite.model.satnum,
-            'current_latitude': subpoint.latitude.degrees,
-            'current_longitude': subpoint.longitude.degrees,
-            'altitude_km': subpoint.elevation.km,
+            'current_latitude': latitude,
+            'current_longitude': longitude,
+            'altitude_km': altitude,
             'epoch': satellite.epoch.utc_iso()
         }
\ No newline at end of file
@@ -3,85 +3,155 @@ Satellite Performance Dashboard
 Comprehensive satellite tracking and analysis system
 """
 
-import matplotlib.pyplot as plt
-from matplotlib.gridspec import GridSpec
 import numpy as np
-from datetime import datetime, timedelta
-from typing import Dict, List, Tuple
-import matplotlib.patches as patches
+from datetime import datetime
+from typing import Dict, List
+
+from src.kernels import altitude_series
+from src.utils import time_grid, julian_date, teme_to_geodetic, earth_mesh
+
+EARTH_MU = 398600.4418  # km^3/s^2
 
 class SatelliteDashboard:
     """
     Creates comprehensive satellite tracking dashboard
+    
+    Build the figure once with create_comprehensive_dashboard(), then call
+    refresh() to move the existing artists to the latest positions.
     """
     
     def __init__(self):
         self.earth_radius = 6371  # km
-        
+        self.fig = None
+        self._axes = {}
+        self._artists = {}
+        self._request = None
+    
     def create_comprehensive_dashboard(self, predictor, satellites_to_track: List[str], 
-                                     duration_hours: float = 6):
+                                     duration_hours: float = 6, points: int = 60,
+                                     show: bool = True):
         """
         Create a comprehensive multi-panel dashboard
-        """
-        # Create figure with subplots
-        fig = plt.figure(figsize=(20, 12))
-        gs = GridSpec(3, 3, figure=fig, hspace=0.3, wspace=0.3)
         
-        # Panel 1: 3D Orbital View (top-left, large)
-        ax1 = fig.add_subplot(gs[0:2, 0:2], projection='3d')
-        self._plot_3d_orbits(ax1, predictor, satellites_to_track, duration_hours)
-        
-        # Panel 2: Ground Track (top-right)
-        ax2 = fig.add_subplot(gs[0, 2])
-        self._plot_ground_tracks(ax2, predictor, satellites_to_track[0] if satellites_to_track else None)
+        All panels share a single batched propagation over the same time grid.
+        Pass show=False to build the figure without entering the GUI loop.
+        """
+        # Imported here so importing this module stays cheap for non-plotting callers
+        import matplotlib.pyplot as plt
+        from matplotlib.gridspec import GridSpec
         
-        # Panel 3: Altitude Profile (middle-right)
-        ax3 = fig.add_subplot(gs[1, 2])
-        self._plot_altitude_profiles(ax3, predictor, satellites_to_track)
+        # Replace any figure this dashboard built earlier instead of leaking it
+        if self.fig is not None:
+            plt.close(self.fig)
         
-        # Panel 4: Satellite Status Table (bottom-left)
-        ax4 = fig.add_subplot(gs[2, 0])
-        self._create_status_table(ax4, predictor, satellites_to_track)
+        self._request = (predictor, satellites_to_track, duration_hours, points)
         
-        # Panel 5: Orbital Elements (bottom-middle)
-        ax5 = fig.add_subplot(gs[2, 1])
-        self._plot_orbital_elements(ax5, predictor, satellites_to_track)
+        # Create figure with subplots
+        fig = plt.figure(figsize=(20, 12))
+        gs = GridSpec(3, 3, figure=fig, hspace=0.3, wspace=0.3)
+        self.fig = fig
+        self._axes = {
+            'orbits': fig.add_subplot(gs[0:2, 0:2], projection='3d'),  # top-left, large
+            'ground_track': fig.add_subplot(gs[0, 2]),                  # top-right
+            'altitude': fig.add_subplot(gs[1, 2]),                      # middle-right
+            'status': fig.add_subplot(gs[2, 0]),                        # bottom-left
+            'elements': fig.add_subplot(gs[2, 1]),                      # bottom-middle
+            'coverage': fig.add_subplot(gs[2, 2]),                      # bottom-right
+        }
         
-        # Panel 6: Coverage Analysis (bottom-right)
-        ax6 = fig.add_subplot(gs[2, 2])
-        self._plot_coverage_analysis(ax6, predictor, satellites_to_track)
+        self._draw_panels(self._compute_tracks())
         
         # Main title
         fig.suptitle('🛰️ SATELLITE TRACKING DASHBOARD - REAL TIME SPACE SITUATIONAL AWARENESS', 
                     fontsize=16, fontweight='bold', y=0.98)
         
         # Add timestamp
-        timestamp = datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')
-        fig.text(0.02, 0.02, f'Generated: {timestamp}', fontsize=10, alpha=0.7)
+        self._artists['timestamp'] = fig.text(0.02, 0.02, self._timestamp_label(),
+                                              fontsize=10, alpha=0.7)
         
-        plt.show()
+        if show:
+            plt.show()
         return fig
     
-    def _plot_3d_orbits(self, ax, predictor, satellites, duration_hours):
+    def refresh(self):
+        """
+        Re-propagate and update the existing figure in place
+        
+        Lines, markers and table cells are updated with set_data/set_text
+        rather than rebuilt, which keeps periodic refreshes cheap.
+        """
+        if self.fig is None:
+            raise RuntimeError("Call create_comprehensive_dashboard() before refresh()")
+        
+        tracks = self._compute_tracks()
+        
+        if tracks['names'] != self._artists.get('names'):
+            # Selection changed (e.g. a satellite left the catalog): redraw panels
+            for ax in self._axes.values():
+                ax.clear()
+            self._draw_panels(tracks)
+        else:
+            self._update_3d_orbits(tracks['positions'])
+            self._update_ground_track(tracks['positions'][:1], tracks['times'])
+            self._update_altitude_profiles(tracks['altitudes'][:3], tracks['times'])
+            self._update_status_table()
+        
+        self._artists['timestamp'].set_text(self._timestamp_label())
+        self.fig.canvas.draw_idle()
+        return self.fig
+    
+    def _compute_tracks(self) -> Dict:
+        """Propagate every tracked satellite once for all panels"""
+        predictor, satellites_to_track, duration_hours, points = self._request
+        
+        # Resolve names once, then propagate every tracked satellite up front
+        names = [name for name in satellites_to_track[:5] if name in predictor.satellites]
+        satellites, _ = predictor.resolve(names)
+        times = time_grid(duration_hours, points)
+        positions = predictor.generate_orbit_paths(names, times=times)
+        
+        # (S, 3, N) -> contiguous (S*N, 3) rows for the altitude kernel
+        rows = positions.transpose(0, 2, 1).reshape(-1, 3)
+        altitudes = altitude_series(rows, self.earth_radius).reshape(len(names), len(times))
+        
+        return {'names': names, 'satellites': satellites, 'times': times,
+                'positions': positions, 'altitudes': altitudes}
+    
+    def _draw_panels(self, tracks: Dict):
+        """Create every panel's artists from scratch"""
+        predictor, satellites_to_track = self._request[:2]
+        names, satellites = tracks['names'], tracks['satellites']
+        axes = self._axes
+        
+        self._artists['names'] = names
+        self._artists['orbits'] = self._plot_3d_orbits(axes['orbits'], names, tracks['positions'])
+        self._artists['ground_track'] = self._plot_ground_tracks(
+            axes['ground_track'], names[:1], tracks['positions'][:1], tracks['times'])
+        self._artists['altitude'] = self._plot_altitude_profiles(
+            axes['altitude'], names[:3], tracks['altitudes'][:3], tracks['times'])
+        self._artists['status'] = self._create_status_table(axes['status'], predictor, satellites_to_track)
+        
+        # Panels 5 and 6 only need TLE mean motion, not propagated positions
+        self._plot_orbital_elements(axes['elements'], names[:4], satellites[:4])
+        self._plot_coverage_analysis(axes['coverage'], names[:3], satellites[:3])
+    
+    def _timestamp_label(self) -> str:
+        """Footer text with the current UTC time"""
+        return f"Generated: {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')}"
+    
+    def _plot_3d_orbits(self, ax, names, positions):
         """3D orbital visualization panel"""
         # Create Earth sphere
-        u = np.linspace(0, 2 * np.pi, 30)
-        v = np.linspace(0, np.pi, 30)
-        x_earth = self.earth_radius * np.outer(np.cos(u), np.sin(v))
-        y_earth = self.earth_radius * np.outer(np.sin(u), np.sin(v))
-        z_earth = self.earth_radius * np.outer(np.ones(np.size(u)), np.cos(v))
-        ax.plot_surface(x_earth, y_earth, z_earth, color='lightblue', alpha=0.4)
+        ax.plot_surface(*earth_mesh(self.earth_radius, 30), color='lightblue', alpha=0.4)
         
         colors = ['red', 'green', 'orange', 'purple', 'yellow']
+        artists = []
         
-        for i, sat_name in enumerate(satellites[:5]):
-            try:
-                x, y, z = predictor.generate_orbit_path(sat_name, duration_hours, 40)
-                color = colors[i % len(colors)]
-                ax.plot(x, y, z, color=color, linewidth=2, label=sat_name.split()[0])
-                ax.scatter(x[0], y[0], z[0], color=color, s=100)
-            except:
-                continue
+        for i, (sat_name, (x, y, z)) in enumerate(zip(names, positions)):
+            color = colors[i % len(colors)]
+            line, = ax.plot(x, y, z, color=color, linewidth=2, label=sat_name.split()[0])
+            marker = ax.scatter(x[0], y[0], z[0], color=color, s=100)
+            artists.append((line, marker))
         
         ax.set_title('3D Orbital Paths')
         ax.legend(fontsize=8)
@@ -89,49 +159,68 @@ class SatelliteDashboard:
         ax.set_xlim(-max_range, max_range)
         ax.set_ylim(-max_range, max_range)
         ax.set_zlim(-max_range, max_range)
+        return artists
+    
+    def _update_3d_orbits(self, positions):
+        """Move existing orbit lines and current-position markers"""
+        for (line, marker), (x, y, z) in zip(self._artists['orbits'], positions):
+            line.set_data_3d(x, y, z)
+            marker._offsets3d = (x[:1], y[:1], z[:1])
+    
+    def _ground_track_coordinates(self, positions, times):
+        """Latitude/longitude of the first satellite over the shared time grid"""
+        jd, fr = julian_date(times)
+        lats, lons, _ = teme_to_geodetic(positions[0].T, jd, fr)
+        return lats, lons
     
-    def _plot_ground_tracks(self, ax, predictor, satellite_name):
+    def _plot_ground_tracks(self, ax, names, positions, times):
         """Ground track panel"""
-        if not satellite_name:
+        if not names:
             ax.text(0.5, 0.5, 'No satellite selected', ha='center', va='center', transform=ax.transAxes)
-            return
-            
+            return None
+        
         try:
-            from src.ground_track import GroundTrackCalculator
-            tracker = GroundTrackCalculator()
-            lats, lons = tracker.calculate_ground_track(predictor, satellite_name, 3, 30)
+            satellite_name = names[0]
+            lats, lons = self._ground_track_coordinates(positions, times)
             
             # Simple world outline
             ax.plot([-180, 180, 180, -180, -180], [-90, -90, 90, 90, -90], 'k-', linewidth=1)
             ax.plot([0, 0], [-90, 90], 'k--', alpha=0.3)
             ax.plot([-180, 180], [0, 0], 'k--', alpha=0.3)
             
-            ax.plot(lons, lats, 'r-', linewidth=2)
-            ax.plot(lons[0], lats[0], 'ro', markersize=8)
+            track, = ax.plot(lons, lats, 'r-', linewidth=2)
+            current, = ax.plot(lons[:1], lats[:1], 'ro', markersize=8)
             
             ax.set_xlim(-180, 180)
             ax.set_ylim(-90, 90)
             ax.set_title(f'Ground Track\n{satellite_name.split()[0]}')
             ax.grid(True, alpha=0.3)
+            return track, current
         except Exception as e:
             ax.text(0.5, 0.5, f'Ground track\nerror: {str(e)[:20]}', ha='center', va='center', transform=ax.transAxes)
+            return None
     
-    def _plot_altitude_profiles(self, ax, predictor, satellites):
+    def _update_ground_track(self, positions, times):
+        """Move the existing ground track line and marker"""
+        if self._artists['ground_track'] is None:
+            return
+        track, current = self._artists['ground_track']
+        lats, lons = self._ground_track_coordinates(positions, times)
+        track.set_data(lons, lats)
+        current.set_data(lons[:1], lats[:1])
+    
+    def _plot_altitude_profiles(self, ax, names, altitudes, times):
         """Altitude profile panel"""
+        lines = []
         try:
             colors = ['red', 'green', 'orange', 'purple', 'yellow']
+            time_points = (times - times[0]) / np.timedelta64(1, 'h')
             
-            for i, sat_name in enumerate(satellites[:3]):
-                try:
-                    x, y, z = predictor.generate_orbit_path(sat_name, 3, 30)
-                    altitudes = np.sqrt(x**2 + y**2 + z**2) - self.earth_radius
-                    time_points = np.linspace(0, 3, len(altitudes))
-                    
-                    color = colors[i % len(colors)]
-                    ax.plot(time_points, altitudes, color=color, linewidth=2, 
-                           label=sat_name.split()[0])
-                except:
-                    continue
+            for i, (sat_name, sat_altitudes) in enumerate(zip(names, altitudes)):
+                color = colors[i % len(colors)]
+                line, = ax.plot(time_points, sat_altitudes, color=color, linewidth=2, 
+                               label=sat_name.split()[0])
+                lines.append(line)
             
             ax.set_xlabel('Time (hours)')
             ax.set_ylabel('Altitude (km)')
@@ -140,57 +229,73 @@ class SatelliteDashboard:
             ax.legend(fontsize=8)
         except:
             ax.text(0.5, 0.5, 'Altitude data\nunavailable', ha='center', va='center', transform=ax.transAxes)
+        return lines
     
-    def _create_status_table(self, ax, predictor, satellites):
-        """Status table panel"""
-        ax.axis('off')
+    def _update_altitude_profiles(self, altitudes, times):
+        """Update altitude lines and rescale the panel"""
+        time_points = (times - times[0]) / np.timedelta64(1, 'h')
+        for line, sat_altitudes in zip(self._artists['altitude'], altitudes):
+            line.set_data(time_points, sat_altitudes)
         
-        # Create table data
-        table_data = [['Satellite', 'Status', 'Altitude']]
+        ax = self._axes['altitude']
+        ax.relim()
+        ax.autoscale_view()
+    
+    def _status_rows(self, predictor, satellites) -> List[List[str]]:
+        """Satellite / status / altitude rows for the status table"""
+        rows = []
+        now = datetime.utcnow()  # one snapshot instant shared by every row
         
         for sat_name in satellites[:4]:
             try:
-                info = predictor.get_satellite_info(sat_name)
+                info = predictor.get_satellite_info(sat_name, now)
                 short_name = sat_name.split()[0]
                 status = "ACTIVE"
                 altitude = f"{info['altitude_km']:.0f} km"
-                table_data.append([short_name, status, altitude])
+                rows.append([short_name, status, altitude])
             except:
-                table_data.append([sat_name.split()[0], "ERROR", "N/A"])
+                rows.append([sat_name.split()[0], "ERROR", "N/A"])
+        
+        return rows
+    
+    def _create_status_table(self, ax, predictor, satellites):
+        """Status table panel"""
+        ax.axis('off')
         
         # Create table
-        table = ax.table(cellText=table_data[1:], colLabels=table_data[0],
+        table = ax.table(cellText=self._status_rows(predictor, satellites),
+                        colLabels=['Satellite', 'Status', 'Altitude'],
                         cellLoc='center', loc='center', cellColours=None)
         table.auto_set_font_size(False)
         table.set_fontsize(9)
         table.scale(1, 2)
         
         ax.set_title('Satellite Status')
+        return table
+    
+    def _update_status_table(self):
+        """Rewrite the existing table cells (row 0 holds the column labels)"""
+        predictor, satellites_to_track = self._request[:2]
+        table = self._artists['status']
+        
+        for row, values in enumerate(self._status_rows(predictor, satellites_to_track), start=1):
+            for col, value in enumerate(values):
+                table[row, col].get_text().set_text(value)
     
-    def _plot_orbital_elements(self, ax, predictor, satellites):
+    def _plot_orbital_elements(self, ax, names, satellites):
         """Orbital elements visualization"""
         try:
-            # Simple orbital period comparison
-            periods = []
-            names = []
-            
-            for sat_name in satellites[:4]:
-                try:
-                    # Rough orbital period calculation
-                    x, y, z = predictor.generate_orbit_path(sat_name, 2, 20)
-                    altitude = np.mean(np.sqrt(x**2 + y**2 + z**2)) - self.earth_radius
-                    # Simplified period calculation
-                    period = 2 * np.pi * np.sqrt((self.earth_radius + altitude)**3 / 398600) / 60  # minutes
-                    periods.append(period)
-                    names.append(sat_name.split()[0])
-                except:
-                    continue
+            # Exact period from the TLE mean motion (rad/min), no propagation needed
+            mean_motion = np.array([sat.model.no_kozai for sat in satellites])
+            periods = list(2 * np.pi / mean_motion)  # minutes
+            labels = [sat_name.split()[0] for sat_name in names]
             
             if periods:
-                bars = ax.bar(names, periods, color=['red', 'green', 'orange', 'purple'][:len(periods)])
+                bars = ax.bar(labels, periods, color=['red', 'green', 'orange', 'purple'][:len(periods)])
                 ax.set_ylabel('Orbital Period (min)')
                 ax.set_title('Orbital Periods')
-                plt.setp(ax.get_xticklabels(), rotation=45, ha='right')
+                for label in ax.get_xticklabels():
+                    label.set(rotation=45, ha='right')
                 
                 # Add value labels on bars
                 for bar, period in zip(bars, periods):
@@ -199,27 +304,23 @@ class SatelliteDashboard:
         except:
             ax.text(0.5, 0.5, 'Orbital elements\ncalculation error', ha='center', va='center', transform=ax.transAxes)
     
-    def _plot_coverage_analysis(self, ax, predictor, satellites):
+    def _plot_coverage_analysis(self, ax, names, satellites):
         """Coverage analysis panel"""
         try:
-            # Simple coverage metrics
-            coverage_data = []
-            labels = []
+            # Semi-major axis from mean motion via Kepler's third law
+            mean_motion = np.array([sat.model.no_kozai for sat in satellites]) / 60  # rad/s
+            semi_major_axis = (EARTH_MU / mean_motion**2) ** (1 / 3)
+            
+            # Area of the spherical cap visible from that orbital radius
+            coverage = 2 * np.pi * self.earth_radius**2 * (1 - self.earth_radius / semi_major_axis)
+            valid = semi_major_axis > self.earth_radius
             
-            for sat_name in satellites[:3]:
-                try:
-                    info = predictor.get_satellite_info(sat_name)
-                    # Simple coverage metric based on altitude
-                    altitude = info['altitude_km']
-                    coverage_area = 2 * np.pi * self.earth_radius * altitude / 1000  # simplified
-                    coverage_data.append(coverage_area)
-                    labels.append(sat_name.split()[0])
-                except:
-                    continue
+            coverage_data = list(coverage[valid])
+            labels = [sat_name.split()[0] for sat_name, ok in zip(names, valid) if ok]
             
             if coverage_data:
-                wedges, texts = ax.pie(coverage_data, labels=labels, autopct='%1.1f%%', 
-                                     colors=['red', 'green', 'orange'][:len(coverage_data)])
+                ax.pie(coverage_data, labels=labels, autopct='%1.1f%%', 
+                       colors=['red', 'green', 'orange'][:len(coverage_data)])
                 ax.set_title('Coverage Comparison')
         except:
             ax.text(0.5, 0.5, 'Coverage analysis\nunavailable', ha='center', va='center', transform=ax.transAxes)
\ No newline at end of file
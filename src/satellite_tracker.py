@@ -0,0 +1,32 @@
+"""
+Satellite Tracker Module
+Wires the TLE fetcher and orbit predictor together for scripts and demos
+"""
+
+from datetime import datetime, date
+from functools import lru_cache
+
+from src.data_fetcher import TLEDataFetcher
+from src.orbit_predictor import SatelliteOrbitPredictor
+
+def load_predictor(group: str = 'stations', cache_dir: str = "data") -> SatelliteOrbitPredictor:
+    """
+    Download (or reuse) a TLE group and return a predictor loaded with it
+    
+    Results are memoized per group for the current UTC day, so scripts that
+    share a process fetch and parse each group once. The returned predictor
+    is shared between callers.
+    """
+    return _load_predictor(group, cache_dir, datetime.utcnow().date())
+
+@lru_cache(maxsize=4)
+def _load_predictor(group: str, cache_dir: str, day: date) -> SatelliteOrbitPredictor:
+    """
+    Fetch and parse one TLE group (day only keys the cache)
+    """
+    fetcher = TLEDataFetcher(cache_dir=cache_dir)
+    tle_file = fetcher.download_tle_data(group)
+    
+    predictor = SatelliteOrbitPredictor()
+    predictor.load_tle_file(tle_file)
+    return predictor
@@ -0,0 +1,102 @@
+"""
+Utilities Module
+Shared time and geodesy helpers for raw SGP4 propagation
+"""
+
+import numpy as np
+from datetime import datetime
+from functools import lru_cache
+from typing import Optional, Tuple
+
+from src import kernels
+
+def time_grid(duration_hours: float, points: int,
+              start_time: Optional[datetime] = None) -> np.ndarray:
+    """
+    Evenly spaced UTC sample times covering the requested window
+    
+    Returns:
+        datetime64[us] array of length points, starting at start_time (default: now)
+    """
+    if start_time is None:
+        start_time = datetime.utcnow()
+    
+    offsets_us = np.linspace(0, duration_hours * 3600e6, points).astype(np.int64)
+    return np.datetime64(start_time, 'us') + offsets_us.astype('timedelta64[us]')
+
+def julian_date(times: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Split UTC times into the (jd, fr) pair expected by the sgp4 library
+    
+    Returns:
+        (jd, fr) arrays: whole Julian date at midnight and day fraction
+    """
+    times = np.asarray(times, dtype='datetime64[us]')
+    days = times.astype('datetime64[D]')
+    jd = days.astype(np.int64) + 2440587.5
+    fr = (times - days) / np.timedelta64(1, 'D')
+    return jd, fr
+
+def gmst(jd, fr):
+    """
+    Greenwich mean sidereal time in radians (IAU 1982 model, UT1 taken as UTC)
+    """
+    t = (jd - 2451545.0 + fr) / 36525.0
+    seconds = (67310.54841 + (876600.0 * 3600 + 8640184.812866) * t
+               + 0.093104 * t**2 - 6.2e-6 * t**3)
+    return np.radians(np.remainder(seconds / 240.0, 360.0))
+
+@lru_cache(maxsize=64)
+def gmst_at(jd: float, fr: float) -> float:
+    """
+    GMST for a single instant, cached so satellites sampled at the same time share it
+    """
+    return float(gmst(jd, fr))
+
+def teme_to_geodetic(r: np.ndarray, jd, fr) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Convert TEME positions to WGS84 geodetic coordinates
+    
+    Args:
+        r: (..., 3) TEME positions in kilometers
+        jd, fr: matching sgp4-style Julian date split
+    
+    Returns:
+        (latitude_deg, longitude_deg, altitude_km)
+    """
+    r = np.asarray(r, dtype=np.float64)
+    shape = r.shape[:-1]
+    
+    # Kernels work on flat (N, 3) rows with one GMST angle per row
+    rows = np.ascontiguousarray(r.reshape(-1, 3))
+    if np.ndim(jd) == 0 and np.ndim(fr) == 0:
+        angle = gmst_at(float(jd), float(fr))
+    else:
+        angle = gmst(jd, fr)
+    theta = np.ascontiguousarray(np.broadcast_to(angle, shape).reshape(-1))
+    lat, lon, alt = kernels.teme_to_geodetic(rows, theta)
+    
+    return lat.reshape(shape)[()], lon.reshape(shape)[()], alt.reshape(shape)[()]
+
+@lru_cache(maxsize=8)
+def earth_mesh(radius: float, resolution: int = 50) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Earth sphere surface coordinates, computed once per (radius, resolution)
+    
+    Returns:
+        read-only (x, y, z) arrays of shape (resolution, resolution)
+    """
+    # Broadcast (resolution, 1) against (1, resolution) instead of np.outer
+    u = np.linspace(0, 2 * np.pi, resolution)
+    v = np.linspace(0, np.pi, resolution)
+    cos_u, sin_u = np.cos(u)[:, None], np.sin(u)[:, None]
+    sin_v, cos_v = np.sin(v)[None, :], np.cos(v)[None, :]
+    
+    x = radius * cos_u * sin_v
+    y = radius * sin_u * sin_v
+    z = np.broadcast_to(radius * cos_v, x.shape)  # read-only view, no copy
+    
+    # Shared between callers, so guard against accidental in-place edits
+    x.flags.writeable = False
+    y.flags.writeable = False
+    return x, y, z
@@ -3,64 +3,181 @@
 Creates interactive 3D plots of satellite orbits around Earth
 """
 
-import matplotlib.pyplot as plt
-from mpl_toolkits.mplot3d import Axes3D
 import numpy as np
-from typing import List, Tuple, Dict
-import matplotlib.patches as patches
-from matplotlib.animation import FuncAnimation
+from math import hypot
+from typing import Tuple, Dict
+
+from src.utils import earth_mesh
+
+# Color palette for different satellites, assigned in order and wrapped with modulo
+ORBIT_COLORS = np.array(['red', 'green', 'orange', 'purple', 'yellow', 'cyan', 'magenta'])
 
 class SatelliteVisualizer:
     """
     Creates 3D visualizations of satellite orbits
+    
+    backend='pyvista' renders orbit plots with VTK instead of matplotlib's
+    3D axes, which stays interactive for large multi-satellite scenes.
     """
     
-    def __init__(self, figsize: Tuple[int, int] = (12, 10)):
+    def __init__(self, figsize: Tuple[int, int] = (12, 10), backend: str = 'matplotlib'):
+        if backend not in ('matplotlib', 'pyvista'):
+            raise ValueError(f"Unknown backend: {backend}")
         self.figsize = figsize
+        self.backend = backend
         self.earth_radius = 6371  # km
         
+        # Build the default Earth mesh up front; every plot reuses it
+        earth_mesh(self.earth_radius)
+    
+    @staticmethod
+    def _plot_coordinates(x, y, z) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Contiguous float32 copies of orbit coordinates; screen space needs no more precision
+        """
+        return tuple(np.ascontiguousarray(c, dtype=np.float32) for c in (x, y, z))
+    
+    @staticmethod
+    def _decimate_path(x, y, z, max_turn_deg: float = 2.0) -> np.ndarray:
+        """
+        Indices of the vertices needed to draw a path to within max_turn_deg
+        
+        A vertex is kept each time the heading change accumulated since the
+        last kept vertex crosses another max_turn_deg; straight stretches
+        collapse, curved ones keep their shape. Endpoints are always kept.
+        """
+        n = len(x)
+        if n < 3:
+            return np.arange(n)
+        
+        segments = np.diff(np.column_stack((x, y, z)).astype(np.float64), axis=0)
+        lengths = np.sqrt(np.einsum('ij,ij->i', segments, segments))
+        cos_turn = np.einsum('ij,ij->i', segments[:-1], segments[1:]) / (lengths[:-1] * lengths[1:])
+        turn = np.degrees(np.arccos(np.clip(cos_turn, -1.0, 1.0)))
+        
+        # NaN turns (failed samples, repeated points) always force a vertex
+        turn = np.where(np.isnan(turn), max_turn_deg, turn)
+        steps = np.floor(np.cumsum(turn) / max_turn_deg)
+        keep = np.flatnonzero(np.diff(steps, prepend=0.0) > 0) + 1
+        return np.concatenate(([0], keep, [n - 1]))
+    
     def create_earth_sphere(self, ax, radius: float = None):
         """
         Create a 3D sphere representing Earth
         """
         if radius is None:
             radius = self.earth_radius
-            
-        # Create sphere coordinates
-        u = np.linspace(0, 2 * np.pi, 50)
-        v = np.linspace(0, np.pi, 50)
-        x = radius * np.outer(np.cos(u), np.sin(v))
-        y = radius * np.outer(np.sin(u), np.sin(v))
-        z = radius * np.outer(np.ones(np.size(u)), np.cos(v))
         
-        # Plot Earth as blue sphere
-        ax.plot_surface(x, y, z, color='lightblue', alpha=0.6)
+        x, y, z = earth_mesh(radius)
         
+        # Plot Earth as blue sphere: coarse faces, drawn first at a fixed depth
+        # instead of being re-sorted against the orbit lines on every draw
+        ax.computed_zorder = False
+        ax.plot_surface(x, y, z, rstride=5, cstride=5, color='lightblue', alpha=0.6,
+                        linewidth=0, antialiased=False, edgecolor='none', shade=False, zorder=0)
+    
     def plot_satellite_orbit(self, orbit_data: Dict[str, Tuple], 
-                           title: str = "Satellite Orbits"):
+                           title: str = "Satellite Orbits", show: bool = True):
         """
         Plot multiple satellite orbits in 3D
         
         Args:
             orbit_data: Dict with satellite names as keys and (x, y, z) arrays as values
             title: Plot title
+            show: Call plt.show(); pass False to just build and return the figure
+        
+        Returns (fig, ax), or the pyvista Plotter with the pyvista backend.
+        """
+        if self.backend == 'pyvista':
+            return self._plot_pyvista(orbit_data, title, show)
+        
+        import matplotlib.pyplot as plt
+        
+        fig, ax, _, _ = self._draw_orbits(orbit_data, title)
+        
+        # Show plot
+        plt.tight_layout()
+        if show:
+            plt.show()
+        
+        return fig, ax
+    
+    def animate_current_position(self, orbit_data: Dict[str, Tuple], interval: int = 200,
+                                 title: str = "Satellite Positions", show: bool = True):
+        """
+        Animate each satellite's position marker along its orbit
+        
+        Earth and the orbit lines are drawn once as a static background; with
+        blitting only the moving markers are repainted each frame.
+        
+        Returns:
+            (fig, animation) - keep a reference to the animation while it runs
+        """
+        import matplotlib.pyplot as plt
+        from matplotlib.animation import FuncAnimation
+        
+        fig, ax, markers, orbits = self._draw_orbits(orbit_data, title)
+        frames = min((len(x) for x, _, _ in orbits), default=0)
+        
+        # (S, 3, frames) so each frame is one slice for the single marker scatter
+        tracks = np.array([[axis[:frames] for axis in orbit] for orbit in orbits])
+        if markers is not None:
+            markers.set_animated(True)
+        
+        def update(frame):
+            markers._offsets3d = tuple(tracks[:, :, frame].T)
+            return (markers,)
+        
+        animation = FuncAnimation(fig, update, frames=frames, interval=interval, blit=True)
+        
+        plt.tight_layout()
+        if show:
+            plt.show()
+        
+        return fig, animation
+    
+    def _draw_orbits(self, orbit_data: Dict[str, Tuple], title: str):
+        """
+        Build the multi-orbit figure
+        
+        All orbits go into one Line3DCollection and all current positions into
+        one scatter, so matplotlib depth-sorts two artists however many
+        satellites are shown.
+        
+        Returns:
+            (fig, ax, current-position scatter or None, float32 (x, y, z) per orbit)
         """
+        # Imported here so importing this module stays cheap for non-plotting callers
+        import matplotlib.pyplot as plt
+        from matplotlib.lines import Line2D
+        from mpl_toolkits.mplot3d.art3d import Line3DCollection
+        
         fig = plt.figure(figsize=self.figsize)
         ax = fig.add_subplot(111, projection='3d')
         
         # Create Earth
         self.create_earth_sphere(ax)
         
-        # Color palette for different satellites
-        colors = ['red', 'green', 'orange', 'purple', 'yellow', 'cyan', 'magenta']
+        # One color per satellite, picked for all of them up front
+        orbit_colors = ORBIT_COLORS[np.arange(len(orbit_data)) % len(ORBIT_COLORS)]
+        
+        # Collect every orbit, drawing each line through only the vertices that shape it
+        orbits, segments, handles = [], [], []
+        for color, (sat_name, coords) in zip(orbit_colors, orbit_data.items()):
+            x, y, z = self._plot_coordinates(*coords)
+            kept = self._decimate_path(x, y, z)
+            orbits.append((x, y, z))
+            segments.append(np.column_stack((x[kept], y[kept], z[kept])))
+            handles.append(Line2D([], [], color=color, linewidth=2, label=sat_name))
         
-        # Plot each satellite orbit
-        for i, (sat_name, (x, y, z)) in enumerate(orbit_data.items()):
-            color = colors[i % len(colors)]
-            ax.plot(x, y, z, color=color, linewidth=2, label=sat_name)
+        markers = None
+        if orbits:
+            ax.add_collection3d(Line3DCollection(segments, colors=orbit_colors, linewidths=2))
             
-            # Mark current position
-            ax.scatter(x[0], y[0], z[0], color=color, s=100, marker='o')
+            # Mark current positions
+            starts = np.array([[axis[0] for axis in orbit] for orbit in orbits])
+            markers = ax.scatter(starts[:, 0], starts[:, 1], starts[:, 2], c=orbit_colors,
+                                 s=100, marker='o', depthshade=False)
         
         # Set labels and title
         ax.set_xlabel('X (km)')
@@ -68,54 +185,64 @@ class SatelliteVisualizer:
         ax.set_zlabel('Z (km)')
         ax.set_title(title)
         
-        # Set equal aspect ratio
-        max_range = np.array([x.max()-x.min(), y.max()-y.min(), z.max()-z.min()]).max() / 2.0
-        mid_x = (x.max()+x.min()) * 0.5
-        mid_y = (y.max()+y.min()) * 0.5
-        mid_z = (z.max()+z.min()) * 0.5
-        ax.set_xlim(mid_x - max_range, mid_x + max_range)
-        ax.set_ylim(mid_y - max_range, mid_y + max_range)
-        ax.set_zlim(mid_z - max_range, mid_z + max_range)
-        
-        # Add legend
-        ax.legend()
+        # Equal aspect: a cubic box, plus one cube of limits around every orbit
+        # (min and max taken once per axis)
+        ax.set_box_aspect((1, 1, 1))
+        if orbits:
+            coords = [np.concatenate(axis) for axis in zip(*orbits)]
+            low = np.array([c.min() for c in coords])
+            high = np.array([c.max() for c in coords])
+            mid, max_range = (high + low) * 0.5, (high - low).max() * 0.5
+        else:
+            mid, max_range = np.zeros(3), self.earth_radius
+        ax.set_xlim3d(mid[0] - max_range, mid[0] + max_range)
+        ax.set_ylim3d(mid[1] - max_range, mid[1] + max_range)
+        ax.set_zlim3d(mid[2] - max_range, mid[2] + max_range)
         
-        # Show plot
-        plt.tight_layout()
-        plt.show()
+        # Add legend (proxy handles, since the collection has no per-orbit labels)
+        ax.legend(handles=handles)
         
-        return fig, ax
+        return fig, ax, markers, orbits
     
     def plot_single_satellite(self, x: np.ndarray, y: np.ndarray, z: np.ndarray, 
-                            satellite_name: str):
+                            satellite_name: str, show: bool = True):
         """
         Plot a single satellite's orbit with enhanced details
+        
+        Pass show=False to build and return the figure without plt.show().
         """
+        if self.backend == 'pyvista':
+            return self._plot_pyvista({satellite_name: (x, y, z)}, satellite_name, show)
+        
+        import matplotlib.pyplot as plt
+        
+        x, y, z = self._plot_coordinates(x, y, z)
+        
         fig = plt.figure(figsize=self.figsize)
         ax = fig.add_subplot(111, projection='3d')
         
         # Create Earth
         self.create_earth_sphere(ax)
         
-        # Plot orbit path
-        ax.plot(x, y, z, color='red', linewidth=3, label=f'{satellite_name} Orbit')
+        # Plot orbit path, with future positions as markers on the same line artist
+        ax.plot(x, y, z, color='red', linewidth=3, marker='.', markersize=3,
+                markerfacecolor='orange', markeredgecolor='orange', markevery=slice(1, None),
+                label=f'{satellite_name} Orbit')
         
         # Mark current position (first point)
-        ax.scatter(x[0], y[0], z[0], color='red', s=200, marker='o', label='Current Position')
+        ax.scatter(x[0], y[0], z[0], color='red', s=200, marker='o', depthshade=False,
+                   label='Current Position')
         
-        # Mark future positions
-        ax.scatter(x[1:], y[1:], z[1:], color='orange', s=20, alpha=0.6)
+        # Only the current altitude is displayed, so compute it for the first point alone
+        altitude = hypot(x[0], y[0], z[0]) - self.earth_radius
         
-        # Calculate and display orbital info
-        orbital_radius = np.sqrt(x**2 + y**2 + z**2)
-        altitude = orbital_radius - self.earth_radius
-        
-        ax.set_title(f'{satellite_name}\nAltitude: {altitude[0]:.1f} km')
+        ax.set_title(f'{satellite_name}\nAltitude: {altitude:.1f} km')
         ax.set_xlabel('X (km)')
         ax.set_ylabel('Y (km)')
         ax.set_zlabel('Z (km)')
         
-        # Set viewing limits
+        # Set viewing limits (cubic box so the Earth stays round)
+        ax.set_box_aspect((1, 1, 1))
         max_coord = max(np.max(np.abs(x)), np.max(np.abs(y)), np.max(np.abs(z)))
         ax.set_xlim(-max_coord, max_coord)
         ax.set_ylim(-max_coord, max_coord)
@@ -123,6 +250,44 @@ class SatelliteVisualizer:
         
         ax.legend()
         plt.tight_layout()
-        plt.show()
+        if show:
+            plt.show()
+        
+        return fig, ax
+    
+    def _plot_pyvista(self, orbit_data: Dict[str, Tuple], title: str, show: bool = True):
+        """
+        Render orbits with pyvista/VTK (GPU-accelerated, optional dependency)
+        """
+        try:
+            import pyvista as pv
+        except ImportError:
+            raise ImportError("The pyvista backend requires pyvista: pip install pyvista") from None
+        
+        plotter = pv.Plotter(title=title)
+        plotter.add_mesh(pv.Sphere(radius=self.earth_radius, theta_resolution=50, phi_resolution=50),
+                         color='lightblue', opacity=0.6)
+        
+        orbit_colors = ORBIT_COLORS[np.arange(len(orbit_data)) % len(ORBIT_COLORS)]
+        plotted = 0
+        for color, (sat_name, coords) in zip(orbit_colors, orbit_data.items()):
+            points = np.column_stack(coords).astype(np.float64)
+            points = points[np.isfinite(points).all(axis=1)]
+            if len(points) < 2:
+                continue
+            plotted += 1
+            
+            plotter.add_mesh(pv.Spline(points, len(points) * 4), color=color, line_width=2,
+                             label=sat_name)
+            
+            # Mark current position
+            plotter.add_mesh(pv.Sphere(radius=self.earth_radius * 0.02, center=points[0]), color=color)
+        
+        # add_legend() raises when no labelled mesh was added
+        if plotted:
+            plotter.add_legend()
+        plotter.add_axes()
+        if show:
+            plotter.show()
         
-        return fig, ax
\ No newline at end of file
+        return plotter
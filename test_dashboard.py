@@ -1,17 +1,12 @@
-from src.data_fetcher import TLEDataFetcher
-from src.orbit_predictor import SatelliteOrbitPredictor
+from src.satellite_tracker import load_predictor
 from src.satellite_dashboard import SatelliteDashboard
 
 def main():
     print("🚀 LOADING SATELLITE TRACKING DASHBOARD...")
     
-    # Get latest satellite data
-    fetcher = TLEDataFetcher(cache_dir="data")
-    tle_file = fetcher.download_tle_data('stations')
-    
-    # Initialize predictor
-    predictor = SatelliteOrbitPredictor()
-    satellites = predictor.load_tle_file(tle_file)
+    # Get satellite data (fetched and parsed once per process)
+    predictor = load_predictor('stations')
+    satellites = predictor.satellites
     
     # Select satellites for dashboard
     available_sats = list(satellites.keys())
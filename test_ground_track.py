@@ -1,13 +1,9 @@
-from src.data_fetcher import TLEDataFetcher
-from src.orbit_predictor import SatelliteOrbitPredictor
+from src.satellite_tracker import load_predictor
 from src.ground_track import GroundTrackCalculator
 
-# Get data
-fetcher = TLEDataFetcher(cache_dir="data")
-tle_file = fetcher.download_tle_data('stations')
-
-predictor = SatelliteOrbitPredictor()
-satellites = predictor.load_tle_file(tle_file)
+# Get satellite data (fetched and parsed once per process)
+predictor = load_predictor('stations')
+satellites = predictor.satellites
 
 # Create ground track calculator
 ground_tracker = GroundTrackCalculator()
@@ -1,14 +1,9 @@
-from src.data_fetcher import TLEDataFetcher
-from src.orbit_predictor import SatelliteOrbitPredictor
+from src.satellite_tracker import load_predictor
 from datetime import datetime
 
-# Download TLE data
-fetcher = TLEDataFetcher(cache_dir="data")
-tle_file = fetcher.download_tle_data('stations')
-
-# Create orbit predictor and load data
-predictor = SatelliteOrbitPredictor()
-satellites = predictor.load_tle_file(tle_file)
+# Get satellite data (fetched and parsed once per process)
+predictor = load_predictor('stations')
+satellites = predictor.satellites
 
 print("Available satellites:")
 for name in list(satellites.keys())[:5]:  # Show first 5
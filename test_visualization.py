@@ -1,14 +1,9 @@
-from src.data_fetcher import TLEDataFetcher
-from src.orbit_predictor import SatelliteOrbitPredictor
+from src.satellite_tracker import load_predictor
 from src.visualization import SatelliteVisualizer
 
-# Get TLE data
-fetcher = TLEDataFetcher(cache_dir="data")
-tle_file = fetcher.download_tle_data('stations')
-
-# Load satellites
-predictor = SatelliteOrbitPredictor()
-satellites = predictor.load_tle_file(tle_file)
+# Get satellite data (fetched and parsed once per process)
+predictor = load_predictor('stations')
+satellites = predictor.satellites
 
 # Create visualizer
 visualizer = SatelliteVisualizer()
@@ -29,15 +24,15 @@ else:
 print("\nGenerating multi-satellite visualization...")
 orbit_data = {}
 
-# Get orbits for first 3 satellites
+# Get orbits for first 3 satellites in one batched SGP4 call
 satellite_names = list(satellites.keys())[:3]
-for sat_name in satellite_names:
-    try:
-        x, y, z = predictor.generate_orbit_path(sat_name, duration_hours=2, points=30)
+try:
+    paths = predictor.generate_orbit_paths(satellite_names, duration_hours=2, points=30)
+    for sat_name, (x, y, z) in zip(satellite_names, paths):
         orbit_data[sat_name] = (x, y, z)
         print(f"Added {sat_name} to visualization")
-    except Exception as e:
-        print(f"Error with {sat_name}: {e}")
+except Exception as e:
+    print(f"Error generating orbits: {e}")
 
 # Plot multiple satellites
 if orbit_data:
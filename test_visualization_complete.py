@@ -1,15 +1,10 @@
-from src.data_fetcher import TLEDataFetcher
-from src.orbit_predictor import SatelliteOrbitPredictor
+from src.satellite_tracker import load_predictor
 from src.visualization import SatelliteVisualizer
 
 def main():
-    # Get TLE data
-    fetcher = TLEDataFetcher(cache_dir="data")
-    tle_file = fetcher.download_tle_data('stations')
-
-    # Load satellites
-    predictor = SatelliteOrbitPredictor()
-    satellites = predictor.load_tle_file(tle_file)
+    # Get satellite data (fetched and parsed once per process)
+    predictor = load_predictor('stations')
+    satellites = predictor.satellites
 
     # Create visualizer
     visualizer = SatelliteVisualizer()
@@ -36,15 +31,15 @@ def main():
         print("\n🛰️ Generating multi-satellite comparison...")
         orbit_data = {}
         
-        # Get orbits for first 3 satellites
+        # Get orbits for first 3 satellites; SatrecArray propagates them together in C
         satellite_names = list(satellites.keys())[:3]
-        for sat_name in satellite_names:
-            try:
-                x, y, z = predictor.generate_orbit_path(sat_name, duration_hours=2, points=40)
+        try:
+            paths = predictor.generate_orbit_paths(satellite_names, duration_hours=2, points=40)
+            for sat_name, (x, y, z) in zip(satellite_names, paths):
                 orbit_data[sat_name] = (x, y, z)
                 print(f"  ✅ Added {sat_name}")
-            except Exception as e:
-                print(f"  ❌ Error with {sat_name}: {e}")
+        except Exception as e:
+            print(f"  ❌ Error generating orbits: {e}")
         
         # Plot multiple satellites
         if orbit_data: